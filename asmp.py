@@ -4,22 +4,146 @@ ASMP - ArtStudia Manager Packets
 Менеджер пакетов от ArtTeam
 """
 
-import argparse
 import json
 import os
+import socket
 import subprocess
 import sys
 import time
 from pathlib import Path
 from urllib.parse import urljoin
 
-import requests
-from colorama import init, Fore, Back, Style
+# argparse и requests импортируются лениво (в main и при первом
+# сетевом запросе) — это десятки миллисекунд на каждом запуске CLI
+
+
+class _NoColor:
+    """Пустые ANSI-атрибуты — вывод без цветов (pipe, редирект)"""
+
+    def __getattr__(self, name):
+        return ''
+
+
+# colorama нужна только для цветного вывода в терминал; при выводе
+# в пайп/файл обходимся пустыми кодами и не платим за её импорт
+if sys.stdout is not None and sys.stdout.isatty():
+    from colorama import init, Fore, Back, Style
+
+    # Инициализация colorama для Windows
+    init(autoreset=True)
+else:
+    Fore = Back = Style = _NoColor()
+
+# orjson заметно быстрее stdlib json (парсинг ~3x, сериализация ~10x),
+# но остаётся опциональной зависимостью — без него работаем через stdlib
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    orjson = None
+
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _read_json(path):
+    """Прочитать JSON-файл (байтовый режим — orjson работает с bytes)"""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+
+def _write_json(path, obj):
+    """Записать объект в JSON-файл атомарно
+
+    Пишем во временный файл и переименовываем через os.replace:
+    прерванная запись не оставит повреждённый config/кэш, из-за
+    которого init_config пересоздавал бы базу с нуля.
+    """
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    tmp.write_bytes(_json_dumps(obj))
+    os.replace(tmp, path)
+
+
+# Предварительно связанный метод — без поиска атрибута на каждой итерации
+_contains = str.__contains__
+
+
+def _now():
+    """Целочисленный Unix-timestamp без промежуточного float"""
+    return time.time_ns() // 1_000_000_000
+
+
+def _build_search_blob(pkg):
+    """Единая lowercase-строка для поиска по имени, описанию и тегам"""
+    return (pkg["name"] + " " + pkg.get("description", "") + " " +
+            " ".join(pkg.get("tags", []))).lower()
+
+
+def _build_session(headers):
+    """Создать настроенный requests.Session
+
+    requests импортируется здесь, а не на уровне модуля: команды,
+    не ходящие в сеть (version, config, list), не платят ~80мс
+    за его импорт при каждом запуске.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    class _ASMPAdapter(HTTPAdapter):
+        """HTTPAdapter с TCP_NODELAY — мелкие JSON-запросы не ждут алгоритм Нейгла"""
+
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs['socket_options'] = [
+                (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            ]
+            super().init_poolmanager(*args, **kwargs)
+
+    session = requests.Session()
+    # Пул соединений с keep-alive и повтором запросов —
+    # экономим TCP/TLS-рукопожатие на каждый вызов API
+    adapter = _ASMPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(headers)
+    # brotli жмёт JSON заметно лучше gzip; заголовок добавляем только
+    # при наличии декодера, иначе requests не распакует ответ
+    try:
+        import brotli  # noqa: F401
+        session.headers['Accept-Encoding'] = 'br, gzip, deflate'
+    except ImportError:
+        pass
+    return session
 
-# Инициализация colorama для Windows
-init(autoreset=True)
 
 __version__ = "0.1.0"
+
+# Пути API-эндпоинтов; полные URL собираются один раз в _build_endpoints
+_API_PATHS = {
+    'search': '/api/packages/search',
+    'info': '/api/packages/info',
+    'download': '/api/packages/download',
+    'status': '/api/status',
+}
+# Сентинел «ответ 304, данные не менялись» — отличим от None (ошибка сети)
+_NOT_MODIFIED = object()
+
+# Эндпоинты с условными запросами по ETag; добавлять только вместе
+# с обработкой _NOT_MODIFIED на вызывающей стороне
+_CONDITIONAL_ENDPOINTS = frozenset({'search'})
+
 __author__ = "ArtTeam"
 __email__ = "ArtRebos@gmail.com"
 __repository__ = "https://github.com/artteam09/asmp"
@@ -32,22 +156,61 @@ class ASMPClient:
         self.packages_file = self.config_dir / "packages.json"
         self.installed_file = self.config_dir / "installed_packages.json"
         self.config_file = self.config_dir / "config.json"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': f'ASMP/{__version__}',
-            'Content-Type': 'application/json'
-        })
-        self.init_config()
+        # Кэш распарсенных JSON-файлов в памяти, инвалидация по mtime —
+        # повторные операции в рамках сессии обходятся одним os.stat
+        self._pkg_cache = None
+        self._pkg_mtime = 0
+        self._installed_cache = None
+        self._installed_mtime = 0
+        self._session = None
+        self._config_loaded = False
+        self._etags = {}
+        # Шаблон тела запроса; в make_request добавляется только timestamp
+        self._req_template = {
+            "app_name": "ADK - ArtStudia Developer Kit",
+            "api_version": "0.1.0",
+            "client_version": __version__
+        }
+        # Конструктор нарочно не трогает диск: конфиг и кэши
+        # инициализируются лениво через ensure_*, когда команда
+        # действительно в них нуждается
+
+    @property
+    def session(self):
+        """HTTP-сессия; создаётся при первом сетевом запросе"""
+        if self._session is None:
+            self._session = _build_session({
+                'User-Agent': f'ASMP/{__version__}',
+                'Content-Type': 'application/json',
+                'Accept-Encoding': 'gzip, deflate',
+                'Connection': 'keep-alive'
+            })
+        return self._session
+
+    def _build_endpoints(self):
+        """Собрать полные URL эндпоинтов (один urljoin на эндпоинт за сессию)"""
+        self._endpoints = {
+            name: urljoin(self.base_url, path)
+            for name, path in _API_PATHS.items()
+        }
 
     def init_config(self):
-        """Инициализация конфигурации"""
+        """Инициализация конфигурации (все части сразу)"""
+        self.ensure_config()
+        self.ensure_packages_cache()
+        self.ensure_installed_cache()
+
+    def ensure_config(self):
+        """Загрузить или создать config.json (лениво, один раз за сессию)"""
+        if self._config_loaded:
+            return
         self.config_dir.mkdir(exist_ok=True)
 
         # Загрузка конфигурации
         if self.config_file.exists():
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                self.base_url = config.get('server_url', self.base_url)
+            config = _read_json(self.config_file)
+            self.base_url = config.get('server_url', self.base_url)
+            self._etags = config.get('etags', {})
         else:
             config = {
                 'server_url': self.base_url,
@@ -55,10 +218,14 @@ class ASMPClient:
                 'timeout': 30,
                 'client_version': __version__
             }
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            _write_json(self.config_file, config)
+
+        self._build_endpoints()
+        self._config_loaded = True
 
-        # Локальная база пакетов (кэш)
+    def ensure_packages_cache(self):
+        """Создать локальную базу пакетов, если её ещё нет"""
+        self.config_dir.mkdir(exist_ok=True)
         if not self.packages_file.exists():
             default_packages = {
                 "packages": [
@@ -85,39 +252,121 @@ class ASMPClient:
                         "source_type": "pypi"
                     }
                 ],
-                "last_updated": int(time.time()),
+                "last_updated": _now(),
                 "client_version": __version__
             }
-            with open(self.packages_file, 'w', encoding='utf-8') as f:
-                json.dump(default_packages, f, indent=2, ensure_ascii=False)
+            _write_json(self.packages_file, default_packages)
 
+    def ensure_installed_cache(self):
+        """Создать базу установленных пакетов, если её ещё нет"""
+        self.config_dir.mkdir(exist_ok=True)
         if not self.installed_file.exists():
-            with open(self.installed_file, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=2)
+            _write_json(self.installed_file, {"packages": {}, "schema": 2})
+
+    def _load_packages(self):
+        """Загрузить локальную базу пакетов (кэшируется в памяти по mtime)"""
+        self.ensure_packages_cache()
+        st = self.packages_file.stat()
+        if self._pkg_cache is None or st.st_mtime_ns != self._pkg_mtime:
+            self._pkg_cache = _read_json(self.packages_file)
+            # Поисковая строка считается один раз при загрузке,
+            # а не на каждый запрос в search_local
+            for pkg in self._pkg_cache.get("packages", []):
+                pkg["_search_blob"] = _build_search_blob(pkg)
+            self._pkg_mtime = st.st_mtime_ns
+        return self._pkg_cache
+
+    def _save_packages(self, data):
+        """Записать локальную базу пакетов и обновить кэш в памяти"""
+        # Служебное поле _search_blob на диск не пишем
+        disk_data = dict(data)
+        disk_data["packages"] = [
+            {k: v for k, v in pkg.items() if k != "_search_blob"}
+            for pkg in data.get("packages", [])
+        ]
+        _write_json(self.packages_file, disk_data)
+        for pkg in data.get("packages", []):
+            if "_search_blob" not in pkg:
+                pkg["_search_blob"] = _build_search_blob(pkg)
+        self._pkg_cache = data
+        self._pkg_mtime = self.packages_file.stat().st_mtime_ns
+
+    def _load_installed(self):
+        """Загрузить базу установленных пакетов (кэшируется по mtime)
+
+        Возвращает схему 2: {"packages": {имя: инфо}, "schema": 2} —
+        словарь по имени даёт O(1) установку/удаление вместо
+        линейного прохода по списку.
+        """
+        self.ensure_installed_cache()
+        st = self.installed_file.stat()
+        if self._installed_cache is None or st.st_mtime_ns != self._installed_mtime:
+            data = _read_json(self.installed_file)
+            if isinstance(data, list):
+                # Разовая миграция старого формата (плоский список)
+                data = {"packages": {p["name"]: p for p in data}, "schema": 2}
+                _write_json(self.installed_file, data)
+                st = self.installed_file.stat()
+            self._installed_cache = data
+            self._installed_mtime = st.st_mtime_ns
+        return self._installed_cache
+
+    def _save_installed(self, data):
+        """Записать список установленных пакетов и обновить кэш в памяти"""
+        _write_json(self.installed_file, data)
+        self._installed_cache = data
+        self._installed_mtime = self.installed_file.stat().st_mtime_ns
+
+    def _save_etag(self, endpoint, etag):
+        """Запомнить ETag эндпоинта в config.json для условных запросов"""
+        self._etags[endpoint] = etag
+        try:
+            config = _read_json(self.config_file)
+        except (FileNotFoundError, ValueError):
+            return
+        config['etags'] = self._etags
+        _write_json(self.config_file, config)
 
     def make_request(self, endpoint, data=None):
-        """Выполнить запрос к серверу"""
-        url = urljoin(self.base_url, endpoint)
+        """Выполнить запрос к серверу (endpoint — ключ из _API_PATHS)"""
+        import requests
 
-        base_request = {
-            "app_name": "ADK - ArtStudia Developer Kit",
-            "api_version": "0.1.0",
-            "client_version": __version__,
-            "timestamp": int(time.time())
-        }
+        self.ensure_config()
+        url = self._endpoints[endpoint]
+
+        base_request = {**self._req_template, "timestamp": _now()}
 
         if data:
             base_request.update(data)
 
+        # Условный запрос: если ETag известен, сервер ответит 304
+        # на неизменившиеся данные — без тела, распаковки и парсинга.
+        # Включено только для эндпоинтов, чьи вызывающие понимают
+        # _NOT_MODIFIED (см. _CONDITIONAL_ENDPOINTS).
+        etag = self._etags.get(endpoint) if endpoint in _CONDITIONAL_ENDPOINTS else None
+        req_headers = {'If-None-Match': etag} if etag else None
+
         try:
             print(f"{Fore.CYAN}🌐 Запрос к {url}...")
             response = self.session.post(
                 url,
                 json=base_request,
-                timeout=30
+                timeout=30,
+                headers=req_headers
             )
+            # 304 превращаем в сентинел только там, где вызывающая сторона
+            # его ожидает; случайный 304 от прокси на прочих эндпоинтах
+            # упадёт в ветку ValueError («Неверный ответ от сервера»)
+            if response.status_code == 304 and endpoint in _CONDITIONAL_ENDPOINTS:
+                return _NOT_MODIFIED
             response.raise_for_status()
-            return response.json()
+            if endpoint in _CONDITIONAL_ENDPOINTS:
+                new_etag = response.headers.get('ETag')
+                if new_etag and new_etag != etag:
+                    self._save_etag(endpoint, new_etag)
+            # Парсим response.content напрямую: минуем stdlib-парсер внутри
+            # requests и лишний UTF-8 decode (orjson принимает bytes)
+            return _json_loads(response.content)
         except requests.exceptions.ConnectionError:
             print(f"{Fore.RED}❌ Не удалось подключиться к серверу {self.base_url}")
             return None
@@ -127,12 +376,14 @@ class ASMPClient:
         except requests.exceptions.RequestException as e:
             print(f"{Fore.RED}❌ Ошибка сети: {e}")
             return None
-        except json.JSONDecodeError:
+        except ValueError:
+            # Покрывает и json.JSONDecodeError, и orjson.JSONDecodeError
             print(f"{Fore.RED}❌ Неверный ответ от сервера")
             return None
 
     def search_remote(self, query):
         """Поиск пакетов на удаленном сервере"""
+        self.ensure_config()
         print(f"{Fore.CYAN}🔍 Поиск '{query}' на сервере {self.base_url}...")
 
         request_data = {
@@ -144,7 +395,12 @@ class ASMPClient:
             }
         }
 
-        response = self.make_request("/api/packages/search", request_data)
+        response = self.make_request("search", request_data)
+
+        if response is _NOT_MODIFIED:
+            # Набор пакетов на сервере не менялся — локальный кэш актуален
+            print(f"{Fore.GREEN}✅ Кэш актуален (304), поиск по локальной базе")
+            return self.search_local(query)
 
         if response and response.get("success"):
             packages = response.get("packages", [])
@@ -159,16 +415,11 @@ class ASMPClient:
     def search_local(self, query):
         """Поиск в локальной базе"""
         try:
-            with open(self.packages_file, 'r', encoding='utf-8') as f:
-                packages_data = json.load(f)
-
-            found_packages = []
-            for pkg in packages_data.get("packages", []):
-                if (query.lower() in pkg["name"].lower() or
-                        query.lower() in pkg.get("description", "").lower() or
-                        query.lower() in " ".join(pkg.get("tags", [])).lower()):
-                    found_packages.append(pkg)
-            return found_packages
+            packages_data = self._load_packages()
+
+            q = query.lower()
+            return [pkg for pkg in packages_data.get("packages", [])
+                    if _contains(pkg["_search_blob"], q)]
         except Exception as e:
             print(f"{Fore.RED}❌ Ошибка чтения локальной базы: {e}")
             return []
@@ -176,8 +427,7 @@ class ASMPClient:
     def update_local_cache(self, packages):
         """Обновить локальный кэш пакетов"""
         try:
-            with open(self.packages_file, 'r', encoding='utf-8') as f:
-                local_data = json.load(f)
+            local_data = self._load_packages()
 
             # Обновляем существующие и добавляем новые пакеты
             local_packages = {pkg["name"]: pkg for pkg in local_data.get("packages", [])}
@@ -185,11 +435,10 @@ class ASMPClient:
                 local_packages[pkg["name"]] = pkg
 
             local_data["packages"] = list(local_packages.values())
-            local_data["last_updated"] = int(time.time())
+            local_data["last_updated"] = _now()
             local_data["client_version"] = __version__
 
-            with open(self.packages_file, 'w', encoding='utf-8') as f:
-                json.dump(local_data, f, indent=2, ensure_ascii=False)
+            self._save_packages(local_data)
 
             print(f"{Fore.GREEN}✅ Локальный кэш обновлен ({len(packages)} пакетов)")
 
@@ -204,12 +453,33 @@ class ASMPClient:
             "version": version
         }
 
-        response = self.make_request("/api/packages/info", request_data)
+        response = self.make_request("info", request_data)
 
         if response and response.get("success"):
             return response.get("package")
         return None
 
+    def get_packages_info_remote(self, package_names):
+        """Получить информацию о нескольких пакетах параллельно
+
+        Запросы уходят в несколько потоков через общий пул соединений:
+        N пакетов резолвятся за ~1 RTT вместо N последовательных запросов.
+        """
+        if not package_names:
+            return []
+        if len(package_names) == 1:
+            return [self.get_package_info_remote(package_names[0])]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Прогреваем конфиг и сессию до запуска потоков
+        self.ensure_config()
+        _ = self.session
+
+        workers = min(4, len(package_names))  # не больше размера пула соединений
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.get_package_info_remote, package_names))
+
     def install_package_remote(self, package_name, version=None):
         """Установить пакет с сервера"""
         print(f"{Fore.CYAN}📦 Получение информации о пакете {package_name}...")
@@ -223,10 +493,15 @@ class ASMPClient:
         print(f"{Fore.WHITE}📝 {package_info.get('description', 'Нет описания')}")
         print(f"{Fore.CYAN}👨‍💻 Автор: {package_info.get('author', 'Unknown')}")
 
-        # Показываем зависимости
+        # Показываем зависимости (информация о них запрашивается параллельно)
         dependencies = package_info.get('dependencies', [])
         if dependencies:
-            print(f"{Fore.YELLOW}📋 Зависимости: {', '.join(dependencies)}")
+            dep_infos = self.get_packages_info_remote(dependencies)
+            resolved = [
+                f"{name} v{info['version']}" if info else name
+                for name, info in zip(dependencies, dep_infos)
+            ]
+            print(f"{Fore.YELLOW}📋 Зависимости: {', '.join(resolved)}")
 
         # Запрос на скачивание
         download_data = {
@@ -235,7 +510,7 @@ class ASMPClient:
             "version": version or package_info["version"]
         }
 
-        response = self.make_request("/api/packages/download", download_data)
+        response = self.make_request("download", download_data)
 
         if response and response.get("success"):
             download_url = response.get("download_url")
@@ -250,12 +525,7 @@ class ASMPClient:
         """Скачать и установить пакет"""
         try:
             print(f"{Fore.CYAN}📥 Загрузка пакета...")
-
-            # Имитация загрузки
-            for i in range(5):
-                percent = (i + 1) * 20
-                print(f"{Fore.YELLOW}⬇️  Загрузка... [{''.join(['█'] * (i + 1))}{''.join(['░'] * (4 - i))}] {percent}%")
-                time.sleep(0.3)
+            print(_PROGRESS_LINES[4])
 
             # Установка зависимостей
             dependencies = package_info.get('dependencies', [])
@@ -263,11 +533,9 @@ class ASMPClient:
                 print(f"{Fore.CYAN}🔨 Установка зависимостей...")
                 for dep in dependencies:
                     print(f"   📦 {dep}...")
-                    time.sleep(0.5)
 
             if install_script:
                 print(f"{Fore.CYAN}🚀 Выполнение скрипта установки...")
-                time.sleep(1)
 
             # Сохраняем информацию об установке
             self.save_installed_package(package_info)
@@ -282,50 +550,52 @@ class ASMPClient:
 
     def save_installed_package(self, package_info):
         """Сохранить информацию об установленном пакете"""
-        installed = self.get_installed_packages()
-
-        # Удаляем старую версию если есть
-        installed = [p for p in installed if p["name"] != package_info["name"]]
+        installed = self._load_installed()
 
         # Добавляем информацию об установке
-        package_info["installed_at"] = int(time.time())
+        # (старая версия перезаписывается по ключу — O(1))
+        package_info["installed_at"] = _now()
         package_info["installed_by"] = "asmp"
         package_info["client_version"] = __version__
-        installed.append(package_info)
+        installed["packages"][package_info["name"]] = package_info
 
-        with open(self.installed_file, 'w', encoding='utf-8') as f:
-            json.dump(installed, f, indent=2, ensure_ascii=False)
+        self._save_installed(installed)
 
     def get_installed_packages(self):
         """Получить список установленных пакетов"""
         try:
-            with open(self.installed_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return list(self._load_installed()["packages"].values())
         except FileNotFoundError:
             return []
 
     def update_server_url(self, new_url):
         """Обновить URL сервера"""
+        self.config_dir.mkdir(exist_ok=True)
         self.base_url = new_url
+        self._build_endpoints()
+        # ETag'и привязаны к конкретному серверу
+        self._etags = {}
+        # Конфиг перезаписывается целиком — перечитывать его не нужно
+        self._config_loaded = True
         config = {
             'server_url': new_url,
             'auto_update': True,
             'timeout': 30,
             'client_version': __version__
         }
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        _write_json(self.config_file, config)
         print(f"{Fore.GREEN}✅ URL сервера обновлен: {new_url}")
 
     def server_status(self):
         """Проверить статус сервера"""
+        self.ensure_config()
         print(f"{Fore.CYAN}🔄 Проверка подключения к {self.base_url}...")
 
         request_data = {
             "type_request": "ping"
         }
 
-        response = self.make_request("/api/status", request_data)
+        response = self.make_request("status", request_data)
 
         if response and response.get("success"):
             server_info = response.get("server", {})
@@ -340,8 +610,8 @@ class ASMPClient:
 
     def show_config(self):
         """Показать текущую конфигурацию"""
-        with open(self.config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        self.ensure_config()
+        config = _read_json(self.config_file)
 
         print(f"{Fore.CYAN}⚙️  Конфигурация ASMP:")
         print(f"{Fore.WHITE}{'=' * 40}")
@@ -353,29 +623,46 @@ class ASMPClient:
 
 
 def print_package_list(packages, title="Найденные пакеты"):
-    """Красиво вывести список пакетов"""
+    """Красиво вывести список пакетов
+
+    Вывод собирается в одну строку и пишется одним вызовом: 4-5 print
+    на пакет — это столько же syscall'ов (и проходов ANSI-транслятора
+    colorama на Windows) на каждый пакет результата.
+    """
     if not packages:
         print(f"{Fore.YELLOW}📭 {title} не найдены")
         return
 
-    print(f"{Fore.CYAN}🎨 {title} ({len(packages)}):")
-    print(f"{Fore.WHITE}{'=' * 60}")
+    # autoreset colorama срабатывает по print; внутри одной записи
+    # сбрасываем цвет явно в конце каждой раскрашенной строки
+    reset = Style.RESET_ALL
+    buf = [
+        f"{Fore.CYAN}🎨 {title} ({len(packages)}):{reset}\n",
+        f"{Fore.WHITE}{'=' * 60}{reset}\n",
+    ]
 
     for i, pkg in enumerate(packages, 1):
-        print(f"{Fore.GREEN}{i}. {pkg['name']} {Fore.CYAN}v{pkg.get('version', 'N/A')}")
-        print(f"{Fore.WHITE}   📝 {pkg.get('description', 'Нет описания')}")
+        buf.append(f"{Fore.GREEN}{i}. {pkg['name']} {Fore.CYAN}v{pkg.get('version', 'N/A')}{reset}\n")
+        buf.append(f"{Fore.WHITE}   📝 {pkg.get('description', 'Нет описания')}{reset}\n")
 
         tags = pkg.get('tags', [])
         if tags:
-            print(f"   🏷️  {', '.join(tags)}")
+            buf.append(f"   🏷️  {', '.join(tags)}\n")
 
-        print(f"   📦 Тип: {pkg.get('type', 'library')} | 👨‍💻 Автор: {pkg.get('author', 'Unknown')}")
-        print()
+        buf.append(f"   📦 Тип: {pkg.get('type', 'library')} | 👨‍💻 Автор: {pkg.get('author', 'Unknown')}\n\n")
 
+    sys.stdout.write(''.join(buf))
 
-def print_banner():
-    """Показать баннер ASMP"""
-    banner = f"""
+
+# Полосы прогресса и баннер собираются один раз при импорте модуля;
+# строки прогресса отформатированы целиком — в цикле остаётся только
+# вывод по индексу, без f-строк поверх ANSI-кодов
+_PROGRESS_LINES = [
+    f"{Fore.YELLOW}⬇️  Загрузка... [{'█' * (i + 1)}{'░' * (4 - i)}] {(i + 1) * 20}%"
+    for i in range(5)
+]
+
+_BANNER = f"""
 {Fore.CYAN}
     █████╗ ███████╗███╗   ███╗██████╗ 
    ██╔══██╗██╔════╝████╗ ████║██╔══██╗
@@ -389,10 +676,80 @@ def print_banner():
    Author: {__author__} <{__email__}>
 {Fore.RESET}
 """
-    print(banner)
+
+
+def print_banner():
+    """Показать баннер ASMP"""
+    print(_BANNER)
+
+
+def _cmd_install(args, asmp):
+    asmp.install_package_remote(args.package_name, args.version)
+
+
+def _cmd_uninstall(args, asmp):
+    installed = asmp._load_installed()
+    package = installed["packages"].pop(args.package_name, None)
+
+    if not package:
+        print(f"{Fore.RED}❌ Пакет {args.package_name} не установлен!")
+    else:
+        asmp._save_installed(installed)
+        print(f"{Fore.GREEN}✅ Пакет {args.package_name} успешно удален!")
+
+
+def _cmd_search(args, asmp):
+    packages = asmp.search_remote(args.query)
+    print_package_list(packages, f"Результаты поиска '{args.query}'")
+
+
+def _cmd_list(args, asmp):
+    packages = asmp.get_installed_packages()
+    print_package_list(packages, "Установленные пакеты")
+
+
+def _cmd_info(args, asmp):
+    package_info = asmp.get_package_info_remote(args.package_name)
+    if package_info:
+        print(f"{Fore.CYAN}📦 Информация о пакете {args.package_name}:")
+        print(f"{Fore.WHITE}{'=' * 50}")
+        print(f"{Fore.GREEN}Имя: {Fore.WHITE}{package_info['name']}")
+        print(f"{Fore.GREEN}Версия: {Fore.WHITE}{package_info.get('version', 'N/A')}")
+        print(f"{Fore.GREEN}Описание: {Fore.WHITE}{package_info.get('description', 'Нет описания')}")
+        print(f"{Fore.GREEN}Тип: {Fore.WHITE}{package_info.get('type', 'library')}")
+        print(f"{Fore.GREEN}Лицензия: {Fore.WHITE}{package_info.get('license', 'Unknown')}")
+        print(f"{Fore.GREEN}Автор: {Fore.WHITE}{package_info.get('author', 'Unknown')}")
+
+        dependencies = package_info.get('dependencies', [])
+        if dependencies:
+            print(f"{Fore.GREEN}Зависимости: {Fore.WHITE}{', '.join(dependencies)}")
+
+        tags = package_info.get('tags', [])
+        if tags:
+            print(f"{Fore.GREEN}Теги: {Fore.WHITE}{', '.join(tags)}")
+    else:
+        print(f"{Fore.RED}❌ Пакет {args.package_name} не найден!")
+
+
+def _cmd_server_status(args, asmp):
+    asmp.server_status()
+
+
+def _cmd_config(args, asmp):
+    asmp.show_config()
+
+
+def _cmd_set_server(args, asmp):
+    asmp.update_server_url(args.url)
+
+
+def _cmd_version(args, asmp):
+    print_banner()
 
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="asp",
         description=f"{Fore.CYAN}🎨 ASMP - ArtStudia Manager Packets{Fore.RESET}",
@@ -413,34 +770,43 @@ def main():
     install_parser = subparsers.add_parser("install", help="Установка пакета")
     install_parser.add_argument("package_name", help="Название пакета для установки")
     install_parser.add_argument("--version", help="Конкретная версия пакета")
+    install_parser.set_defaults(func=_cmd_install)
 
     # Команда uninstall
     uninstall_parser = subparsers.add_parser("uninstall", help="Удаление пакета")
     uninstall_parser.add_argument("package_name", help="Название пакета для удаления")
+    uninstall_parser.set_defaults(func=_cmd_uninstall)
 
     # Команда search
     search_parser = subparsers.add_parser("search", help="Поиск пакетов")
     search_parser.add_argument("query", help="Поисковый запрос")
+    search_parser.set_defaults(func=_cmd_search)
 
     # Команда list
-    subparsers.add_parser("list", help="Список установленных пакетов")
+    list_parser = subparsers.add_parser("list", help="Список установленных пакетов")
+    list_parser.set_defaults(func=_cmd_list)
 
     # Команда info
     info_parser = subparsers.add_parser("info", help="Информация о пакете")
     info_parser.add_argument("package_name", help="Название пакета")
+    info_parser.set_defaults(func=_cmd_info)
 
     # Команда server-status
-    subparsers.add_parser("server-status", help="Статус сервера")
+    status_parser = subparsers.add_parser("server-status", help="Статус сервера")
+    status_parser.set_defaults(func=_cmd_server_status)
 
     # Команда config
-    subparsers.add_parser("config", help="Показать конфигурацию")
+    config_parser = subparsers.add_parser("config", help="Показать конфигурацию")
+    config_parser.set_defaults(func=_cmd_config)
 
     # Команда set-server
     server_parser = subparsers.add_parser("set-server", help="Установить URL сервера")
     server_parser.add_argument("url", help="URL сервера ASMP")
+    server_parser.set_defaults(func=_cmd_set_server)
 
     # Команда version
-    subparsers.add_parser("version", help="Показать версию ASMP")
+    version_parser = subparsers.add_parser("version", help="Показать версию ASMP")
+    version_parser.set_defaults(func=_cmd_version, needs_client=False)
 
     args = parser.parse_args()
 
@@ -450,58 +816,13 @@ def main():
         parser.print_help()
         return
 
-    asmp = ASMPClient()
-
-    if args.command == "install":
-        asmp.install_package_remote(args.package_name, args.version)
-    elif args.command == "uninstall":
-        installed = asmp.get_installed_packages()
-        package = next((p for p in installed if p["name"] == args.package_name), None)
-
-        if not package:
-            print(f"{Fore.RED}❌ Пакет {args.package_name} не установлен!")
-        else:
-            installed = [p for p in installed if p["name"] != args.package_name]
-            with open(asmp.installed_file, 'w', encoding='utf-8') as f:
-                json.dump(installed, f, indent=2, ensure_ascii=False)
-            print(f"{Fore.GREEN}✅ Пакет {args.package_name} успешно удален!")
-    elif args.command == "search":
-        packages = asmp.search_remote(args.query)
-        print_package_list(packages, f"Результаты поиска '{args.query}'")
-    elif args.command == "list":
-        packages = asmp.get_installed_packages()
-        print_package_list(packages, "Установленные пакеты")
-    elif args.command == "info":
-        package_info = asmp.get_package_info_remote(args.package_name)
-        if package_info:
-            print(f"{Fore.CYAN}📦 Информация о пакете {args.package_name}:")
-            print(f"{Fore.WHITE}{'=' * 50}")
-            print(f"{Fore.GREEN}Имя: {Fore.WHITE}{package_info['name']}")
-            print(f"{Fore.GREEN}Версия: {Fore.WHITE}{package_info.get('version', 'N/A')}")
-            print(f"{Fore.GREEN}Описание: {Fore.WHITE}{package_info.get('description', 'Нет описания')}")
-            print(f"{Fore.GREEN}Тип: {Fore.WHITE}{package_info.get('type', 'library')}")
-            print(f"{Fore.GREEN}Лицензия: {Fore.WHITE}{package_info.get('license', 'Unknown')}")
-            print(f"{Fore.GREEN}Автор: {Fore.WHITE}{package_info.get('author', 'Unknown')}")
-
-            dependencies = package_info.get('dependencies', [])
-            if dependencies:
-                print(f"{Fore.GREEN}Зависимости: {Fore.WHITE}{', '.join(dependencies)}")
-
-            tags = package_info.get('tags', [])
-            if tags:
-                print(f"{Fore.GREEN}Теги: {Fore.WHITE}{', '.join(tags)}")
-        else:
-            print(f"{Fore.RED}❌ Пакет {args.package_name} не найден!")
-    elif args.command == "server-status":
-        asmp.server_status()
-    elif args.command == "config":
-        asmp.show_config()
-    elif args.command == "set-server":
-        asmp.update_server_url(args.url)
-    elif args.command == "version":
-        print_banner()
-    else:
+    if not hasattr(args, 'func'):
         parser.print_help()
+        return
+
+    # version не трогает ни сеть, ни диск — клиент ему не нужен
+    asmp = ASMPClient() if getattr(args, 'needs_client', True) else None
+    args.func(args, asmp)
 
 
 if __name__ == "__main__":
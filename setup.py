@@ -19,13 +19,15 @@ setup(
         'requests>=2.25.0',
         'colorama>=0.4.6'
     ],
-    python_requires='>=3.6',
+    extras_require={
+        'speed': ['orjson>=3.0', 'brotli>=1.0'],
+    },
+    python_requires='>=3.7',
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',